@@ -1,7 +1,5 @@
-import asyncio
-import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+import orjson
+from aiohttp import web
 try:
     from .mcp_client import create_mcp_client
 except ImportError:
@@ -10,82 +8,78 @@ except ImportError:
 # Global client instance
 mcp_client = None
 
-class ChatHandler(BaseHTTPRequestHandler):
-    def do_POST(self):
-        if self.path == "/v1/chat":
-            try:
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                request_data = json.loads(post_data.decode('utf-8'))
-                
-                user_message = request_data.get('user_message', '')
-                if not user_message:
-                    self.send_error(400, "Missing user_message")
-                    return
-                
-                # Run async chat function
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                response = loop.run_until_complete(mcp_client.chat_with_tools(user_message))
-                loop.close()
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                
-                response_data = json.dumps({"response": response})
-                self.wfile.write(response_data.encode('utf-8'))
-                
-            except Exception as e:
-                self.send_error(500, f"Chat error: {str(e)}")
-        else:
-            self.send_error(404, "Not found")
-    
-    def do_GET(self):
-        if self.path == "/health":
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            health_data = {
-                "status": "healthy",
-                "mcp_connected": mcp_client is not None,
-                "available_tools": list(mcp_client.available_tools.keys()) if mcp_client else []
-            }
-            self.wfile.write(json.dumps(health_data).encode('utf-8'))
-        else:
-            self.send_error(404, "Not found")
-    
-    def log_message(self, format, *args):
-        return  # Suppress default logging
+def _health_payload() -> bytes:
+    """Serialize the /health body for the current MCP client."""
+    return orjson.dumps({
+        "status": "healthy",
+        "mcp_connected": mcp_client is not None,
+        "available_tools": mcp_client.tool_names if mcp_client else []
+    })
 
-async def initialize_mcp_client():
+# Precomputed /health body; tools only change when the client connects
+_health_body = _health_payload()
+
+def _json_response(data) -> web.Response:
+    """Build a JSON response straight from orjson's bytes output."""
+    return web.Response(body=orjson.dumps(data), content_type="application/json")
+
+async def chat(request):
+    """Handle a chat message with potential tool calling."""
+    try:
+        # orjson parses the raw body bytes; no intermediate str decode
+        request_data = orjson.loads(await request.read())
+    except ValueError:
+        raise web.HTTPBadRequest(text="Invalid JSON body")
+    if not isinstance(request_data, dict):
+        raise web.HTTPBadRequest(text="JSON body must be an object")
+
+    user_message = request_data.get('user_message', '')
+    if not user_message:
+        raise web.HTTPBadRequest(text="Missing user_message")
+
+    try:
+        response = await mcp_client.chat_with_tools(user_message)
+    except Exception as e:
+        raise web.HTTPInternalServerError(text=f"Chat error: {str(e)}")
+
+    return _json_response({"response": response})
+
+async def health(request):
+    """Report server and MCP connection status."""
+    return web.Response(body=_health_body, content_type="application/json")
+
+async def initialize_mcp_client(app=None):
     """Initialize MCP client."""
-    global mcp_client
+    global mcp_client, _health_body
     try:
         mcp_client = await create_mcp_client("app/main.py")
+        _health_body = _health_payload()
         print("MCP client connected successfully")
-        print(f"Available tools: {list(mcp_client.available_tools.keys())}")
+        print(f"Available tools: {list(mcp_client.tool_names)}")
     except Exception as e:
         print(f"Failed to connect MCP client: {e}")
         raise
 
+async def close_mcp_client(app=None):
+    """Shut down the MCP server process."""
+    if mcp_client is not None:
+        await mcp_client.close()
+
+def create_app() -> web.Application:
+    """Create the aiohttp application."""
+    app = web.Application()
+    app.router.add_post("/v1/chat", chat)
+    app.router.add_get("/health", health)
+    # Connect on the serving loop so the client is shared by all requests
+    app.on_startup.append(initialize_mcp_client)
+    app.on_cleanup.append(close_mcp_client)
+    return app
+
 def run_server(port=8001):
     """Run the HTTP server."""
-    # Initialize MCP client
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    loop.run_until_complete(initialize_mcp_client())
-    loop.close()
-    
-    # Start HTTP server
-    server = HTTPServer(('0.0.0.0', port), ChatHandler)
     print(f"Server running on http://0.0.0.0:{port}")
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        print("\nShutting down server...")
-        server.shutdown()
+    web.run_app(create_app(), host='0.0.0.0', port=port, print=None)
+    print("\nShutting down server...")
 
 if __name__ == "__main__":
-    run_server()
\ No newline at end of file
+    run_server()
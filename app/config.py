@@ -1,2 +1,3 @@
 MODEL_NAME  = "gemma3:12b"
 MAX_LOOPS   = 3          # hard stop to avoid infinite retries
+KEEP_ALIVE  = "10m"      # keep the model and its prompt KV cache loaded between turns
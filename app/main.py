@@ -1,18 +1,17 @@
 from fastmcp import FastMCP
-from tools import get_time, random_joke
+from tools import get_time_async, random_joke
 
 mcp = FastMCP("GemmaRetryDemo")
 
-# Register tools with MCP
-@mcp.tool()
-def get_time_tool(timezone: str = "UTC") -> str: 
-    """Get current time for a given timezone."""
-    return get_time(timezone)
+# (function, tool name, description) registered directly with MCP
+_TOOLS = [
+    (get_time_async, "get_time_tool", "Get current time for a given timezone."),
+    (random_joke, "random_joke_tool", "Get a random programming joke."),
+]
 
-@mcp.tool()
-def random_joke_tool() -> str: 
-    """Get a random programming joke."""
-    return random_joke()
+# Register tools with MCP
+for fn, name, description in _TOOLS:
+    mcp.tool(name=name, description=description)(fn)
 
 if __name__ == "__main__":
     mcp.run()
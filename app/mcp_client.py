@@ -1,22 +1,50 @@
 import asyncio
 import json
+import re
 import ollama
 from typing import List, Dict, Any
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 try:
-    from .config import MODEL_NAME, MAX_LOOPS
+    from .config import MODEL_NAME, MAX_LOOPS, KEEP_ALIVE
 except ImportError:
-    from config import MODEL_NAME, MAX_LOOPS
+    from config import MODEL_NAME, MAX_LOOPS, KEEP_ALIVE
+
+_JSON_DECODER = json.JSONDecoder()
+_PROMPT_TEMPLATE = """You have access to these tools:
+{tools}
+
+When you need to use a tool, respond with a JSON object in this format:
+{{"tool_call": {{"name": "tool_name", "arguments": {{...}}}}}}
+
+To call several independent tools at once, list them all in one object:
+{{"tool_calls": [{{"name": "tool_name", "arguments": {{...}}}}, {{"name": "other_tool", "arguments": {{...}}}}]}}
+
+After calling a tool, use the result to provide a helpful response to the user.
+If you don't need to use any tools, respond normally without the JSON format.
+"""
+
+# Opening of a tool call (or batch of calls), tolerating whitespace variants
+_TOOL_CALL_RE = re.compile(r'\{\s*"tool_calls?"\s*:')
 
 class MCPOllamaClient:
     def __init__(self, server_script_path: str):
         self.server_script_path = server_script_path
-        self.ollama_client = ollama.Client()
+        self.ollama_client = ollama.AsyncClient()
         self.available_tools = {}
+        self.tool_names = ()
+        self._system_prompt = ""
+        self._session = None
+        self._session_task = None
+        self._session_closed = None
+        self._session_lock = asyncio.Lock()
     
-    async def get_tools_info(self):
-        """Get tools info from MCP server."""
+    async def _run_session(self, ready: asyncio.Future):
+        """Own the stdio/session contexts until close() is requested.
+        
+        anyio requires these contexts to be exited by the task that entered
+        them, so they live in a dedicated task rather than the caller's.
+        """
         server_params = StdioServerParameters(
             command="python", 
             args=[self.server_script_path]
@@ -26,16 +54,51 @@ class MCPOllamaClient:
             async with stdio_client(server_params) as (read, write):
                 async with ClientSession(read, write) as session:
                     await session.initialize()
-                    tools_result = await session.list_tools()
-                    
-                    tools_info = {}
-                    for tool in tools_result.tools:
-                        tools_info[tool.name] = {
-                            'description': tool.description,
-                            'input_schema': tool.inputSchema
-                        }
-                    
-                    return tools_info
+                    self._session = session
+                    ready.set_result(session)
+                    await self._session_closed.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                print(f"MCP session terminated: {e}")
+        finally:
+            self._session = None
+            if not ready.done():
+                ready.cancel()
+    
+    async def _ensure_session(self) -> ClientSession:
+        """Start the MCP server process once and reuse its session."""
+        async with self._session_lock:
+            if self._session is None:
+                ready = asyncio.get_running_loop().create_future()
+                self._session_closed = asyncio.Event()
+                self._session_task = asyncio.create_task(self._run_session(ready))
+                await ready
+            return self._session
+    
+    async def close(self):
+        """Shut down the MCP server process."""
+        async with self._session_lock:
+            if self._session_task is not None:
+                self._session_closed.set()
+                await self._session_task
+                self._session_task = None
+    
+    async def get_tools_info(self):
+        """Get tools info from MCP server."""
+        try:
+            session = await self._ensure_session()
+            tools_result = await session.list_tools()
+            
+            tools_info = {}
+            for tool in tools_result.tools:
+                tools_info[tool.name] = {
+                    'description': tool.description,
+                    'input_schema': tool.inputSchema
+                }
+            
+            return tools_info
         except Exception as e:
             print(f"Error getting tools info: {e}")
             return {}
@@ -43,85 +106,104 @@ class MCPOllamaClient:
     async def connect(self):
         """Connect and get available tools."""
         self.available_tools = await self.get_tools_info()
+        # Tools only change on (re)connect, so derive these once here
+        self.tool_names = tuple(self.available_tools.keys())
+        self._system_prompt = self._build_system_prompt()
         return self.available_tools
     
-    def create_system_prompt(self) -> str:
+    def _build_system_prompt(self) -> str:
         """Create system prompt with available tools information."""
-        tools_info = []
-        for name, info in self.available_tools.items():
-            tools_info.append(f"- {name}: {info['description']}")
-        
-        return f"""You have access to these tools:
-{chr(10).join(tools_info)}
-
-When you need to use a tool, respond with a JSON object in this format:
-{{"tool_call": {{"name": "tool_name", "arguments": {{...}}}}}}
-
-After calling a tool, use the result to provide a helpful response to the user.
-If you don't need to use any tools, respond normally without the JSON format.
-"""
+        tools_block = "\n".join(
+            f"- {name}: {info['description']}"
+            for name, info in self.available_tools.items()
+        )
+        return _PROMPT_TEMPLATE.format(tools=tools_block)
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Call a tool via MCP and return the result."""
-        server_params = StdioServerParameters(
-            command="python", 
-            args=[self.server_script_path]
-        )
-        
         try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    result = await session.call_tool(tool_name, arguments)
-                    # Convert result content to string if it's not already
-                    if hasattr(result.content, '__iter__') and not isinstance(result.content, str):
-                        content_str = str(result.content[0].text) if result.content else ""
-                    else:
-                        content_str = str(result.content)
-                    return {"success": True, "result": content_str}
+            session = await self._ensure_session()
+            result = await session.call_tool(tool_name, arguments)
+            # MCP returns a list of content blocks; tools here emit one text block
+            content = result.content
+            if isinstance(content, list):
+                content_str = content[0].text if content else ""
+            else:
+                content_str = content if isinstance(content, str) else str(content)
+            return {"success": True, "result": content_str}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def _stream_response(self, history: List[Dict[str, str]]) -> tuple[str, List[Dict[str, Any]]]:
+        """Stream a model reply and return (text, tool_calls).
+        
+        Generation is cut off as soon as a complete tool call has been
+        received, so the model's trailing text is never waited for.
+        """
+        stream = await self.ollama_client.chat(
+            model=MODEL_NAME,
+            messages=history,
+            stream=True,
+            keep_alive=KEEP_ALIVE
+        )
+        
+        text = ""
+        tool_calls = []
+        try:
+            async for chunk in stream:
+                text += chunk["message"]["content"]
+                tool_calls = self.extract_tool_calls(text)
+                if tool_calls:
+                    break
+        finally:
+            # Closing the stream drops the connection, which stops generation
+            await stream.aclose()
+        
+        return text, tool_calls
+    
+    def _format_tool_results(self, tool_calls: List[Dict[str, Any]], tool_results: List[Dict[str, Any]]) -> str:
+        """Render tool results as the user turn fed back to the model."""
+        lines = []
+        for tool_call, tool_result in zip(tool_calls, tool_results):
+            outcome = tool_result['result'] if tool_result['success'] else 'Error: ' + tool_result['error']
+            if len(tool_calls) == 1:
+                lines.append(f"Tool result: {outcome}")
+            else:
+                lines.append(f"Tool result ({tool_call['name']}): {outcome}")
+        return "\n".join(lines)
+    
     async def chat_with_tools(self, user_message: str) -> str:
         """Handle a chat message with potential tool calling."""
         if not self.available_tools:
             return "Error: No tools available"
         
-        system_prompt = self.create_system_prompt()
         history = [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": self._system_prompt},
             {"role": "user", "content": user_message}
         ]
         
         for attempt in range(MAX_LOOPS):
             try:
-                # Get response from Ollama
-                response = self.ollama_client.chat(
-                    model=MODEL_NAME,
-                    messages=history
-                )
+                # Get response from Ollama, stopping early on a tool call
+                assistant_msg, tool_calls = await self._stream_response(history)
                 
-                assistant_msg = response["message"]["content"]
-                
-                # Check if it's a tool call
-                tool_call = self.extract_tool_call(assistant_msg)
-                
-                if not tool_call:
+                if not tool_calls:
                     # No tool call, return the response
                     return assistant_msg
                 
-                # Execute the tool call
-                tool_result = await self.call_tool(
-                    tool_call["name"], 
-                    tool_call["arguments"]
-                )
+                # Execute the tool calls; independent calls run concurrently
+                tool_results = await asyncio.gather(*(
+                    self.call_tool(tool_call["name"], tool_call["arguments"])
+                    for tool_call in tool_calls
+                ))
                 
-                # Add the interaction to history
+                # Append only, so the next request shares this prefix and
+                # Ollama can reuse its KV cache instead of re-prefilling it
                 history.extend([
                     {"role": "assistant", "content": assistant_msg},
                     {
                         "role": "user", 
-                        "content": f"Tool result: {tool_result['result'] if tool_result['success'] else 'Error: ' + tool_result['error']}"
+                        "content": self._format_tool_results(tool_calls, tool_results)
                     }
                 ])
                 
@@ -134,32 +216,39 @@ If you don't need to use any tools, respond normally without the JSON format.
         
         return "Sorry, I couldn't complete that request after several attempts."
     
-    def extract_tool_call(self, text: str) -> Dict[str, Any] | None:
-        """Extract tool call from assistant message."""
-        try:
-            # Look for JSON with tool_call structure
-            if '{"tool_call":' in text:
-                start = text.find('{"tool_call":')
-                end = text.find('}', start)
-                if end != -1:
-                    # Find the matching closing brace
-                    brace_count = 0
-                    for i in range(start, len(text)):
-                        if text[i] == '{':
-                            brace_count += 1
-                        elif text[i] == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                end = i
-                                break
-                    
-                    json_str = text[start:end+1]
-                    parsed = json.loads(json_str)
-                    return parsed["tool_call"]
-        except (json.JSONDecodeError, KeyError):
-            pass
+    def extract_tool_calls(self, text: str) -> List[Dict[str, Any]]:
+        """Extract tool calls from assistant message.
+        
+        Accepts a single {"tool_call": {...}} or a batch {"tool_calls": [...]}
+        and returns a list of {"name", "arguments"} dicts (empty if none).
+        """
+        # Most replies are plain prose; reject them with a single C-level scan
+        if '"tool_call' not in text:
+            return []
+        
+        match = _TOOL_CALL_RE.search(text)
+        if not match:
+            return []
         
-        return None
+        try:
+            # raw_decode stops at the end of the first complete JSON value,
+            # so braces inside string arguments are handled correctly
+            parsed, _end = _JSON_DECODER.raw_decode(text, match.start())
+            if "tool_calls" in parsed:
+                calls = parsed["tool_calls"]
+            else:
+                calls = [parsed["tool_call"]]
+            return [
+                {"name": call["name"], "arguments": call.get("arguments", {})}
+                for call in calls
+            ]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return []
+    
+    def extract_tool_call(self, text: str) -> Dict[str, Any] | None:
+        """Extract the first tool call from assistant message."""
+        tool_calls = self.extract_tool_calls(text)
+        return tool_calls[0] if tool_calls else None
 
 async def create_mcp_client(server_script_path: str = "app/main.py") -> MCPOllamaClient:
     """Create and connect an MCP client."""
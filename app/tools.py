@@ -1,16 +1,17 @@
 from datetime import datetime
+from functools import lru_cache
 import random
+from typing import Dict, Optional
 from zoneinfo import ZoneInfo, available_timezones
-import ollama
 
-def _normalize_timezone_with_llm(user_input: str) -> str:
-    """Use LLM to convert user timezone input to proper IANA timezone identifier."""
-    
-    # Get available timezones for context
-    available_zones = list(available_timezones())
-    
-    # Create a prompt for the LLM to normalize timezone
-    prompt = f"""Convert the user's timezone input to a proper IANA timezone identifier.
+# Valid IANA identifiers, built once for O(1) validation of LLM answers
+_VALID_TZS = frozenset(available_timezones())
+# The same identifiers keyed by upper case, so "utc" or "asia/tokyo" also
+# resolve without the LLM (no two IANA names differ only by case)
+_CANONICAL_TZS = {name.upper(): name for name in _VALID_TZS}
+
+# Static prompt text; only the user input is filled in per call
+_TZ_PROMPT_TEMPLATE = """Convert the user's timezone input to a proper IANA timezone identifier.
 
 User input: "{user_input}"
 
@@ -30,44 +31,153 @@ Rules:
 
 Respond with ONLY the IANA timezone identifier, nothing else."""
 
+# Common abbreviations resolved without the LLM (rule 3 of the prompt).
+# Checked before the IANA names, so an entry overrides the zone of the same
+# name. Only two do: "EST", which the prompt remaps explicitly, and "GMT",
+# mapped to the equivalent fixed UTC+0 "Etc/GMT". "CET" and "MST" are left
+# to IANA.
+_TZ_ABBREVIATIONS = {
+    "JST": "Asia/Tokyo",
+    "KST": "Asia/Seoul",
+    "HKT": "Asia/Hong_Kong",
+    "SGT": "Asia/Singapore",
+    "IST": "Asia/Kolkata",
+    "EST": "America/New_York",
+    "EDT": "America/New_York",
+    "CST": "America/Chicago",
+    "CDT": "America/Chicago",
+    "MDT": "America/Denver",
+    "PST": "America/Los_Angeles",
+    "PDT": "America/Los_Angeles",
+    "GMT": "Etc/GMT",
+    "BST": "Europe/London",
+    "CEST": "Europe/Paris",
+    "AEST": "Australia/Sydney",
+    "AEDT": "Australia/Sydney",
+}
+
+# LLM answers keyed by raw user input, shared by the sync and async paths.
+# Failed calls and invalid answers are never stored, so neither an outage
+# nor one bad sample is pinned as "UTC".
+_LLM_TZ_CACHE: Dict[str, str] = {}
+_LLM_TZ_CACHE_SIZE = 1024
+
+# Shared Ollama clients, created on first use so that tools which never
+# call the LLM do not pay for importing ollama
+_OLLAMA_CLIENT = None
+_OLLAMA_ASYNC_CLIENT = None
+
+def _ollama_client():
+    """Return the shared ollama.Client."""
+    global _OLLAMA_CLIENT
+    if _OLLAMA_CLIENT is None:
+        import ollama
+        _OLLAMA_CLIENT = ollama.Client()
+    return _OLLAMA_CLIENT
+
+def _ollama_async_client():
+    """Return the shared ollama.AsyncClient."""
+    global _OLLAMA_ASYNC_CLIENT
+    if _OLLAMA_ASYNC_CLIENT is None:
+        import ollama
+        _OLLAMA_ASYNC_CLIENT = ollama.AsyncClient()
+    return _OLLAMA_ASYNC_CLIENT
+
+def _timezone_prompt(user_input: str) -> str:
+    """Create a prompt for the LLM to normalize timezone."""
+    return _TZ_PROMPT_TEMPLATE.format(user_input=user_input)
+
+def _remember_timezone(user_input: str, llm_answer: str) -> str:
+    """Validate the LLM answer and cache it for this input."""
+    normalized_tz = llm_answer.strip()
+    
+    # Validate the result is a real timezone; an invalid answer is not
+    # cached, so the next call for this input asks the LLM again
+    if normalized_tz not in _VALID_TZS:
+        return "UTC"  # Fallback if LLM returns invalid timezone
+    
+    if len(_LLM_TZ_CACHE) >= _LLM_TZ_CACHE_SIZE:
+        del _LLM_TZ_CACHE[next(iter(_LLM_TZ_CACHE))]  # Evict oldest entry
+    _LLM_TZ_CACHE[user_input] = normalized_tz
+    return normalized_tz
+
+def _lookup_timezone(user_input: str) -> Optional[str]:
+    """Resolve the input without the LLM, or return None if it is needed."""
+    key = user_input.strip().upper()
+    abbreviation = _TZ_ABBREVIATIONS.get(key)
+    if abbreviation:
+        return abbreviation
+    
+    # Already-valid identifiers need no model round-trip (rule 1 of the prompt)
+    canonical = _CANONICAL_TZS.get(key)
+    if canonical:
+        return canonical
+    return _LLM_TZ_CACHE.get(user_input)
+
+def _normalize_timezone_with_llm(user_input: str) -> str:
+    """Use LLM to convert user timezone input to proper IANA timezone identifier."""
+    
+    known_tz = _lookup_timezone(user_input)
+    if known_tz:
+        return known_tz
+    
+    try:
+        response = _ollama_client().chat(
+            model="gemma3:12b",
+            messages=[{"role": "user", "content": _timezone_prompt(user_input)}]
+        )
+        return _remember_timezone(user_input, response["message"]["content"])
+    except Exception:
+        return "UTC"  # Fallback if LLM call fails
+
+async def _normalize_timezone_with_llm_async(user_input: str) -> str:
+    """Async variant of _normalize_timezone_with_llm that does not block the event loop."""
+    
+    known_tz = _lookup_timezone(user_input)
+    if known_tz:
+        return known_tz
+    
     try:
-        client = ollama.Client()
-        response = client.chat(
+        response = await _ollama_async_client().chat(
             model="gemma3:12b",
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": _timezone_prompt(user_input)}]
         )
-        
-        normalized_tz = response["message"]["content"].strip()
-        
-        # Validate the result is a real timezone
-        if normalized_tz in available_zones:
-            return normalized_tz
-        else:
-            return "UTC"  # Fallback if LLM returns invalid timezone
-            
+        return _remember_timezone(user_input, response["message"]["content"])
     except Exception:
         return "UTC"  # Fallback if LLM call fails
 
-def get_time(timezone: str = "UTC") -> str:
-    """Return current time string for a specific timezone."""
+@lru_cache(maxsize=256)
+def _zone_info(name: str) -> ZoneInfo:
+    """Return a ZoneInfo, keeping it alive beyond ZoneInfo's small internal cache."""
+    return ZoneInfo(name)
+
+def _format_time(timezone: str, normalized_tz: str) -> str:
+    """Format the current time in a normalized timezone."""
     try:
-        # Use LLM to normalize timezone input
-        normalized_tz = _normalize_timezone_with_llm(timezone)
-        
         # Get current time in the normalized timezone
-        tz = ZoneInfo(normalized_tz)
+        tz = _zone_info(normalized_tz)
         current_time = datetime.now(tz)
         
         # Format time nicely
         formatted_time = current_time.strftime("%Y-%m-%d %H:%M:%S %Z")
         
         return f"Current time in {timezone} ({normalized_tz}): {formatted_time}"
-        
+    
     except Exception as e:
         # Fallback to UTC if anything goes wrong
-        utc_time = datetime.now(ZoneInfo("UTC"))
+        utc_time = datetime.now(_zone_info("UTC"))
         return f"Error getting time for '{timezone}'. Current UTC time: {utc_time.strftime('%Y-%m-%d %H:%M:%S %Z')}"
 
+def get_time(timezone: str = "UTC") -> str:
+    """Return current time string for a specific timezone."""
+    # Use LLM to normalize timezone input
+    return _format_time(timezone, _normalize_timezone_with_llm(timezone))
+
+async def get_time_async(timezone: str = "UTC") -> str:
+    """Return current time string for a specific timezone without blocking."""
+    # Use LLM to normalize timezone input
+    return _format_time(timezone, await _normalize_timezone_with_llm_async(timezone))
+
 def random_joke() -> str:
     """Return a canned dad joke."""
     jokes = [
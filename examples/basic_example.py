@@ -20,6 +20,12 @@ def add_numbers(a: int, b: int) -> str:
     """Simple function that adds two numbers."""
     return f"{a} + {b} = {a + b}"
 
+# One client for the whole script so its HTTP connection is reused
+client = ollama.Client()
+
+# Reused for every response instead of building a decoder per call
+_JSON_DECODER = json.JSONDecoder()
+
 # System prompt that teaches Gemma 3 about function calling
 SYSTEM_PROMPT = """You can call these functions:
 
@@ -36,26 +42,16 @@ Examples:
 
 def extract_function_call(response: str):
     """Extract function call from Gemma's response."""
+    start = response.find('{"tool_call":')
+    if start == -1:
+        return None
     try:
-        if '{"tool_call":' in response:
-            start = response.find('{"tool_call":')
-            # Simple JSON extraction - find matching braces
-            brace_count = 0
-            end = start
-            for i in range(start, len(response)):
-                if response[i] == '{':
-                    brace_count += 1
-                elif response[i] == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        end = i
-                        break
-            
-            json_str = response[start:end + 1]
-            return json.loads(json_str)["tool_call"]
-    except:
-        pass
-    return None
+        # raw_decode parses one complete JSON object starting at `start`,
+        # correctly skipping braces that appear inside strings
+        parsed, _end = _JSON_DECODER.raw_decode(response, start)
+        return parsed["tool_call"]
+    except (ValueError, KeyError):
+        return None
 
 def execute_function(name: str, args: dict):
     """Execute the requested function."""
@@ -68,8 +64,6 @@ def execute_function(name: str, args: dict):
 
 def simple_chat(user_message: str):
     """Simple chat with function calling."""
-    client = ollama.Client()
-    
     # Step 1: Send user message with system prompt
     response = client.chat(
         model="gemma3:12b",
@@ -9,50 +9,158 @@ without the complexity of MCP or complex architectures. It shows:
 3. Function execution and response handling
 4. Simple retry logic for robust interaction
 
-Run: python examples/simple_function_calling.py
+Run: python examples/simple_function_calling.py [-v]
 """
 
+import argparse
+import ast
+import asyncio
+import logging
 import ollama
 import json
+import operator
+import os
 import re
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+try:
+    import orjson  # Optional; faster cache keys when installed
+except ImportError:
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+# Reused for every response; raw_decode runs in CPython's C JSON scanner
+_JSON_DECODER = json.JSONDecoder()
+# Start of a tool call, allowing the whitespace variants Gemma sometimes emits
+_TOOL_CALL_RE = re.compile(r'\{\s*"tool_call"\s*:')
+# Start of a JSON array of objects, as in a batched reply
+_BATCH_START_RE = re.compile(r'\[\s*\{')
+
+# Bound once at import; get_current_time's "timezone" argument (the name
+# the model sends) would otherwise shadow the datetime module's class
+_UTC = dt_timezone.utc
 
 # Simple tool functions
 def get_current_time(timezone: str = "UTC") -> str:
     """Get current time. For demo purposes, just returns current UTC time with timezone label."""
-    current_time = datetime.utcnow()
+    current_time = datetime.now(_UTC)
     return f"Current time in {timezone}: {current_time.strftime('%Y-%m-%d %H:%M:%S')} {timezone}"
 
+# Arithmetic supported by calculate(), dispatched by AST node type
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+}
+_UNARY_OPS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+# Translation table that deletes every character calculate() accepts
+_STRIP_ALLOWED_CHARS = str.maketrans('', '', '0123456789+-*/.() ')
+
+@lru_cache(maxsize=256)
+def _parse_expression(expression: str) -> ast.expr:
+    """Parse a math expression once; repeated expressions skip the parser."""
+    return ast.parse(expression, mode="eval").body
+
+def _evaluate(node: ast.expr):
+    """Evaluate a parsed expression, allowing only numbers and basic arithmetic."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        return _BINARY_OPS[type(node.op)](_evaluate(node.left), _evaluate(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_evaluate(node.operand))
+    raise ValueError(f"Unsupported expression element: {type(getattr(node, 'op', node)).__name__}")
+
 def calculate(expression: str) -> str:
     """Safely calculate simple math expressions."""
     try:
-        # Only allow basic math operations for safety
-        allowed_chars = set('0123456789+-*/.() ')
-        if not all(c in allowed_chars for c in expression):
+        # Only allow basic math operations for safety: deleting every
+        # allowed character must leave nothing behind
+        if expression.translate(_STRIP_ALLOWED_CHARS):
             return "Error: Invalid characters in expression"
         
-        result = eval(expression)
+        result = _evaluate(_parse_expression(expression))
         return f"Result: {expression} = {result}"
     except Exception as e:
         return f"Error calculating '{expression}': {str(e)}"
 
+# Mock weather data, keyed by both lowercase and Title Case spellings so
+# typical inputs ("Tokyo", "New York") hit without a .lower() copy
+_WEATHER = {
+    "tokyo": "Sunny, 22°C",
+    "london": "Cloudy, 15°C", 
+    "new york": "Rainy, 18°C",
+    "paris": "Partly cloudy, 19°C"
+}
+_WEATHER.update({city.title(): weather for city, weather in _WEATHER.items()})
+
 def get_weather(city: str) -> str:
     """Mock weather function for demo purposes."""
     # In real implementation, this would call a weather API
-    weather_data = {
-        "tokyo": "Sunny, 22°C",
-        "london": "Cloudy, 15°C", 
-        "new york": "Rainy, 18°C",
-        "paris": "Partly cloudy, 19°C"
-    }
-    
-    city_lower = city.lower()
-    if city_lower in weather_data:
-        return f"Weather in {city}: {weather_data[city_lower]}"
+    weather = _WEATHER.get(city) or _WEATHER.get(city.lower())
+    if weather:
+        return f"Weather in {city}: {weather}"
     else:
         return f"Weather data not available for {city}"
 
+# One async client for the whole script so its HTTP connection is reused
+# and independent chats can overlap (see chat_with_tools_many)
+client = ollama.AsyncClient()
+
+# Opt-in memo of model replies keyed by (model, conversation), for repeated
+# runs of the same prompts (e.g. demos or CI). Off by default because
+# sampling makes replies vary, and a cached reply hides that.
+_CACHE_RESPONSES = os.environ.get("GEMMA_CACHE") == "1"
+_RESPONSE_CACHE: Dict[tuple, str] = {}
+_RESPONSE_CACHE_SIZE = 1024
+
+async def _request_content(model: str, conversation: List[Dict[str, str]], stop_on_tool_call: bool) -> str:
+    """Ask the model for a reply, optionally cutting it off after a tool call."""
+    if not stop_on_tool_call:
+        response = await client.chat(model=model, messages=conversation)
+        return response["message"]["content"]
+    
+    stream = await client.chat(model=model, messages=conversation, stream=True)
+    text = ""
+    try:
+        async for chunk in stream:
+            text += chunk["message"]["content"]
+            try:
+                if _parse_tool_call(text) is not None:
+                    break
+            except ValueError:
+                continue  # Tool call still arriving
+    finally:
+        # Closing the stream drops the connection, which stops generation
+        await stream.aclose()
+    return text
+
+async def _chat_content(model: str, conversation: List[Dict[str, str]], stop_on_tool_call: bool = False) -> str:
+    """Send the conversation to the model and return the reply text."""
+    if not _CACHE_RESPONSES:
+        return await _request_content(model, conversation, stop_on_tool_call)
+    
+    if orjson is not None:
+        key = (model, orjson.dumps(conversation, option=orjson.OPT_SORT_KEYS))
+    else:
+        key = (model, json.dumps(conversation, sort_keys=True))
+    content = _RESPONSE_CACHE.get(key)
+    if content is None:
+        content = await _request_content(model, conversation, stop_on_tool_call)
+        if len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_SIZE:
+            del _RESPONSE_CACHE[next(iter(_RESPONSE_CACHE))]  # Evict oldest entry
+        _RESPONSE_CACHE[key] = content
+    return content
+
 # Available tools registry
 AVAILABLE_TOOLS = {
     "get_current_time": {
@@ -78,17 +186,31 @@ AVAILABLE_TOOLS = {
     }
 }
 
+# Flat views of the registry, built once at import: name -> function for
+# dispatch, and name -> pre-rendered prompt line for the system prompt
+_TOOL_NAMES = tuple(AVAILABLE_TOOLS)
+_TOOL_FN = {name: info["function"] for name, info in AVAILABLE_TOOLS.items()}
+# Parameter names per tool, in declaration order
+_ARITY = {name: tuple(info["parameters"]) for name, info in AVAILABLE_TOOLS.items()}
+_TOOL_DESC = {
+    name: "- {}({}): {}".format(
+        name,
+        ", ".join(f"{p}: {details['description']}" for p, details in info["parameters"].items()),
+        info["description"]
+    )
+    for name, info in AVAILABLE_TOOLS.items()
+}
+
+@lru_cache(maxsize=1)
 def create_system_prompt() -> str:
-    """Create system prompt that teaches Gemma 3 how to call functions."""
+    """Create system prompt that teaches Gemma 3 how to call functions.
     
-    # Build tool descriptions
-    tool_descriptions = []
-    for name, info in AVAILABLE_TOOLS.items():
-        params = ", ".join([f"{p}: {details['description']}" for p, details in info["parameters"].items()])
-        tool_descriptions.append(f"- {name}({params}): {info['description']}")
+    AVAILABLE_TOOLS is fixed at import time, so the prompt is built once.
+    """
+    tool_descriptions = "\n".join(_TOOL_DESC.values())
     
     return f"""You have access to these tools:
-{chr(10).join(tool_descriptions)}
+{tool_descriptions}
 
 When you need to use a tool, respond with a JSON object in this exact format:
 {{"tool_call": {{"name": "tool_name", "arguments": {{"param1": "value1", "param2": "value2"}}}}}}
@@ -102,61 +224,73 @@ After calling a tool, I'll provide the result and you should give a helpful resp
 If you don't need to use any tools, respond normally without JSON.
 """
 
+def _parse_tool_call(text: str) -> Optional[Dict[str, Any]]:
+    """Return the tool call in text, or None; raises ValueError if it is incomplete or malformed."""
+    # Most final answers are plain prose; reject them with a single C-level scan
+    if '"tool_call"' not in text:
+        return None
+    
+    # Look for the tool_call pattern
+    match = _TOOL_CALL_RE.search(text)
+    if not match:
+        return None
+    
+    # raw_decode parses exactly one JSON object from the match,
+    # so braces inside string arguments don't confuse it
+    parsed, _end = _JSON_DECODER.raw_decode(text, match.start())
+    return parsed.get("tool_call")
+
 def extract_tool_call(text: str) -> Optional[Dict[str, Any]]:
     """Extract tool call JSON from Gemma 3 response."""
     try:
-        # Look for the tool_call pattern
-        if '{"tool_call":' not in text:
-            return None
-        
-        # Find the start of JSON
-        start = text.find('{"tool_call":')
-        if start == -1:
-            return None
-        
-        # Find matching closing brace by counting braces
-        brace_count = 0
-        end = start
-        
-        for i in range(start, len(text)):
-            if text[i] == '{':
-                brace_count += 1
-            elif text[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    end = i
-                    break
-        
-        # Extract and parse JSON
-        json_str = text[start:end + 1]
-        parsed = json.loads(json_str)
-        
-        return parsed.get("tool_call")
-        
-    except (json.JSONDecodeError, KeyError) as e:
-        print(f"Failed to parse tool call: {e}")
+        return _parse_tool_call(text)
+    except ValueError as e:
+        log.warning("Failed to parse tool call: %s", e)
         return None
 
+def extract_batch_items(text: str) -> List[Dict[str, Any]]:
+    """Extract the JSON array of per-question items from a batched response."""
+    error = None
+    # Brackets in leading prose ("see [1]") are skipped by trying each
+    # array-of-objects opening in turn until one decodes to valid items
+    for match in _BATCH_START_RE.finditer(text):
+        try:
+            # raw_decode reads exactly one top-level array, ignoring any prose after it
+            items, _end = _JSON_DECODER.raw_decode(text, match.start())
+        except ValueError as e:
+            error = e
+            continue
+        
+        items = [item for item in items if isinstance(item, dict) and isinstance(item.get("index"), int)]
+        if items:
+            return items
+    
+    if error is not None:
+        log.warning("Failed to parse batch response: %s", error)
+    return []
+
 def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> str:
     """Execute a tool function with given arguments."""
-    if tool_name not in AVAILABLE_TOOLS:
+    function = _TOOL_FN.get(tool_name)
+    if function is None:
         return f"Error: Unknown tool '{tool_name}'"
     
-    tool_info = AVAILABLE_TOOLS[tool_name]
-    function = tool_info["function"]
-    
     try:
+        # Every tool here takes one argument: when the model sent exactly
+        # that one, pass it positionally instead of unpacking a kwargs dict
+        params = _ARITY[tool_name]
+        if len(params) == 1 and len(arguments) == 1 and params[0] in arguments:
+            return function(arguments[params[0]])
+        
         # Call function with arguments
         result = function(**arguments)
         return result
     except Exception as e:
         return f"Error executing {tool_name}: {str(e)}"
 
-def chat_with_tools(user_message: str, model: str = "gemma3:12b", max_iterations: int = 3) -> str:
+async def chat_with_tools(user_message: str, model: str = "gemma3:12b", max_iterations: int = 3) -> str:
     """Main chat function that handles tool calling with Gemma 3."""
     
-    client = ollama.Client()
-    
     # Initialize conversation
     conversation = [
         {"role": "system", "content": create_system_prompt()},
@@ -164,13 +298,12 @@ def chat_with_tools(user_message: str, model: str = "gemma3:12b", max_iterations
     ]
     
     for iteration in range(max_iterations):
-        print(f"\n--- Iteration {iteration + 1} ---")
+        log.debug("--- Iteration %d ---", iteration + 1)
         
-        # Get response from Gemma 3
+        # Get response from Gemma 3, stopping as soon as a tool call is complete
         try:
-            response = client.chat(model=model, messages=conversation)
-            assistant_response = response["message"]["content"]
-            print(f"Gemma 3 says: {assistant_response}")
+            assistant_response = await _chat_content(model, conversation, stop_on_tool_call=True)
+            log.debug("Gemma 3 says: %s", assistant_response)
             
         except Exception as e:
             return f"Error communicating with model: {str(e)}"
@@ -180,34 +313,95 @@ def chat_with_tools(user_message: str, model: str = "gemma3:12b", max_iterations
         
         if tool_call is None:
             # No tool call, this is the final response
-            print("No tool call detected. Conversation complete.")
+            log.debug("No tool call detected. Conversation complete.")
             return assistant_response
         
         # Execute the tool call
         tool_name = tool_call.get("name")
         arguments = tool_call.get("arguments", {})
         
-        print(f"Tool call detected: {tool_name} with args {arguments}")
+        log.info("Tool call detected: %s with args %s", tool_name, arguments)
         
         tool_result = execute_tool(tool_name, arguments)
-        print(f"Tool result: {tool_result}")
+        log.info("Tool result: %s", tool_result)
         
-        # Add the interaction to conversation history
-        conversation.extend([
-            {"role": "assistant", "content": assistant_response},
-            {"role": "user", "content": f"Tool result: {tool_result}"}
-        ])
+        # Add the interaction to conversation history as one turn; the
+        # assistant's JSON echo is dropped, so the next prompt is shorter
+        conversation.append(
+            {"role": "user", "content": f"Tool '{tool_name}' returned: {tool_result}"}
+        )
         
         # Continue to next iteration for final response
     
     return "Maximum iterations reached without final response."
 
-def main():
+async def chat_with_tools_many(user_messages: List[str], model: str = "gemma3:12b") -> List[str]:
+    """Answer independent messages concurrently.
+    
+    Ollama only generates them in parallel when started with
+    OLLAMA_NUM_PARALLEL > 1; otherwise requests queue on the server.
+    """
+    return await asyncio.gather(*(chat_with_tools(message, model) for message in user_messages))
+
+# Questions per model call; larger batches make each reply slower and less reliable
+BATCH_SIZE = 8
+
+BATCH_INSTRUCTIONS = """You will receive several numbered questions. Reply with ONLY a JSON array
+containing one object per question, in order. Each object is either:
+- {"index": N, "tool_call": {"name": "tool_name", "arguments": {...}}} if the question needs a tool
+- {"index": N, "answer": "..."} if you can answer directly
+"""
+
+async def chat_batched(questions: List[str], model: str = "gemma3:12b") -> List[str]:
+    """Answer independent questions with one model call per batch instead of one per question."""
+    answers = []
+    for start in range(0, len(questions), BATCH_SIZE):
+        answers.extend(await _chat_batch(questions[start:start + BATCH_SIZE], model))
+    return answers
+
+async def _chat_batch(questions: List[str], model: str) -> List[str]:
+    """Answer up to BATCH_SIZE questions in at most two model calls."""
+    conversation = [
+        {"role": "system", "content": create_system_prompt() + "\n" + BATCH_INSTRUCTIONS},
+        {"role": "user", "content": "\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1))}
+    ]
+    
+    try:
+        assistant_response = await _chat_content(model, conversation)
+    except Exception as e:
+        return [f"Error communicating with model: {str(e)}"] * len(questions)
+    
+    items = extract_batch_items(assistant_response)
+    answers = {item["index"]: item["answer"] for item in items if "answer" in item}
+    
+    # Run every requested tool, then ask for all final answers in one follow-up
+    tool_results = []
+    for item in items:
+        tool_call = item.get("tool_call")
+        if isinstance(tool_call, dict):
+            tool_result = execute_tool(tool_call.get("name"), tool_call.get("arguments", {}))
+            tool_results.append(f"{item['index']}. Tool result: {tool_result}")
+    
+    if tool_results:
+        conversation.extend([
+            {"role": "assistant", "content": assistant_response},
+            {"role": "user", "content": "\n".join(tool_results) + '\nNow reply with ONLY the JSON array of {"index": N, "answer": "..."} for every question.'}
+        ])
+        try:
+            for item in extract_batch_items(await _chat_content(model, conversation)):
+                if "answer" in item:
+                    answers[item["index"]] = item["answer"]
+        except Exception as e:
+            log.warning("Error communicating with model: %s", e)
+    
+    return [str(answers.get(i, "No answer returned.")) for i in range(1, len(questions) + 1)]
+
+async def main():
     """Interactive demo of Gemma 3 function calling."""
     
     print("🤖 Gemma 3 Function Calling Demo")
     print("=" * 40)
-    print("Available tools: get_current_time, calculate, get_weather")
+    print(f"Available tools: {', '.join(_TOOL_NAMES)}")
     print("Type 'quit' to exit")
     print()
     
@@ -239,7 +433,7 @@ def main():
             print("-" * 40)
             
             # Get response with tool calling
-            response = chat_with_tools(user_input)
+            response = await chat_with_tools(user_input)
             
             print(f"\nFinal Response: {response}")
             print("=" * 40)
@@ -251,4 +445,14 @@ def main():
             print(f"Error: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-v", "--verbose", action="store_true", help="show per-iteration model output")
+    args = parser.parse_args()
+    # Configure only this script's logger; the root logger stays at WARNING
+    # so httpx/httpcore don't log every request to Ollama. Lazy %-formatting
+    # means suppressed debug traces cost no string building.
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,24 @@
+import sys
+import os
+import pytest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.mcp_client import create_mcp_client
+
+def pytest_collection_modifyitems(items):
+    """Run async tests that use the shared MCP client under the anyio plugin."""
+    for item in items:
+        if "client" in getattr(item, "fixturenames", ()):
+            item.add_marker(pytest.mark.anyio)
+
+@pytest.fixture(scope="module")
+def anyio_backend():
+    """Run the async tests on asyncio, matching the script runners."""
+    return "asyncio"
+
+@pytest.fixture(scope="module")
+async def client(anyio_backend):
+    """One MCP client shared by every test in a module."""
+    client = await create_mcp_client("app/main.py")
+    yield client
+    await client.close()
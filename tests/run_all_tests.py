@@ -33,7 +33,10 @@ def run_sync_tests():
     # Test timezone functionality
     print("\n2. Testing Timezone Functionality:")
     try:
-        from tests.test_timezone import test_timezone_normalization, test_misspelled_timezone
+        from tests.test_timezone import (
+            test_known_timezones_skip_llm, test_timezone_normalization, test_misspelled_timezone
+        )
+        test_known_timezones_skip_llm()
         test_timezone_normalization()
         test_misspelled_timezone()
         print("✅ Timezone tests PASSED")
@@ -42,7 +45,19 @@ def run_sync_tests():
         print(f"❌ Timezone test FAILED: {e}")
         timezone_passed = False
     
-    return ollama_passed and timezone_passed
+    # Test the example script's helpers
+    print("\n3. Testing Example Helpers:")
+    try:
+        from tests.test_examples import test_extract_batch_items, test_calculate
+        test_extract_batch_items()
+        test_calculate()
+        print("✅ Example tests PASSED")
+        examples_passed = True
+    except Exception as e:
+        print(f"❌ Example test FAILED: {e}")
+        examples_passed = False
+    
+    return ollama_passed and timezone_passed and examples_passed
 
 async def run_async_tests():
     """Run asynchronous tests."""
@@ -51,7 +66,7 @@ async def run_async_tests():
     print("=" * 50)
     
     # Test MCP connection
-    print("\n3. Testing MCP Connection:")
+    print("\n4. Testing MCP Connection:")
     try:
         from tests.test_mcp import test_mcp_connection
         if await test_mcp_connection():
@@ -65,12 +80,16 @@ async def run_async_tests():
         mcp_passed = False
     
     # Test tool calling
-    print("\n4. Testing Tool Calling:")
+    print("\n5. Testing Tool Calling:")
     try:
-        from tests.test_tool_call import run_all_tests
-        await run_all_tests()
-        print("✅ Tool calling tests completed")
-        tool_passed = True
+        from tests.test_tool_call import run_all_tests, test_extract_tool_call
+        test_extract_tool_call()
+        if await run_all_tests():
+            print("✅ Tool calling tests PASSED")
+            tool_passed = True
+        else:
+            print("❌ Tool calling tests FAILED")
+            tool_passed = False
     except Exception as e:
         print(f"❌ Tool calling test ERROR: {e}")
         tool_passed = False
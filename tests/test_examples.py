@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the helpers in examples/simple_function_calling.py.
+No Ollama server is needed.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'examples'))
+
+from simple_function_calling import _evaluate, _parse_expression, calculate, extract_batch_items
+
+def test_extract_batch_items():
+    """Test batched answer extraction from the example script."""
+    text = 'Here [see 1] [{"index": 1, "answer": "a"}, {"index": 2, "tool_call": {"name": "calculate", "arguments": {"expression": "[1]"}}}] Done.'
+    assert extract_batch_items(text) == [
+        {"index": 1, "answer": "a"},
+        {"index": 2, "tool_call": {"name": "calculate", "arguments": {"expression": "[1]"}}}
+    ]
+    
+    assert extract_batch_items('[{"index": 1, "answer": "a"}, "junk", {"answer": "no index"}]') == [
+        {"index": 1, "answer": "a"}
+    ]
+    
+    assert extract_batch_items("No JSON here [1]") == []
+    assert extract_batch_items('[{"index": 1, "answer": ') == []
+    print("Extract batch items test passed")
+
+def test_calculate():
+    """Test the calculator's AST evaluator."""
+    assert calculate("1 + 2") == "Result: 1 + 2 = 3"
+    assert calculate("7 - 10") == "Result: 7 - 10 = -3"
+    assert calculate("(2 + 3) * 4") == "Result: (2 + 3) * 4 = 20"
+    assert calculate("7 / 2") == "Result: 7 / 2 = 3.5"
+    assert calculate("7 // 2") == "Result: 7 // 2 = 3"
+    assert calculate("-5 + +2") == "Result: -5 + +2 = -3"
+    
+    # Exponentiation is outside the supported operators
+    assert calculate("2**3").startswith("Error calculating '2**3'")
+    # Names and tuples are stopped by the character check...
+    assert calculate("x + 1") == "Error: Invalid characters in expression"
+    assert calculate("(1, 2)") == "Error: Invalid characters in expression"
+    # ...and by the evaluator itself
+    for expression in ("x + 1", "(1, 2)", "abs(1)"):
+        try:
+            _evaluate(_parse_expression(expression))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{expression!r} was evaluated")
+    
+    assert calculate("1 / 0") == "Error calculating '1 / 0': division by zero"
+    assert calculate("1 // 0").startswith("Error calculating '1 // 0'")
+    print("Calculate test passed")
+
+if __name__ == "__main__":
+    test_extract_batch_items()
+    test_calculate()
+    print("All example tests passed!")
\ No newline at end of file
@@ -5,17 +5,33 @@ Requires the chat server to be running on localhost:8001.
 """
 
 import requests
-import json
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+# Requests in flight at once. Ollama generates them one at a time unless
+# OLLAMA_NUM_PARALLEL is raised, so each request's timeout also covers
+# waiting behind the others (30s apiece, as when they ran in sequence)
+_MAX_WORKERS = 4
+_TIMEOUT = 30 * _MAX_WORKERS
+
+# One keep-alive session for every request; the pool is sized for the
+# concurrent runner below so no thread has to open a fresh connection
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=_MAX_WORKERS))
 
 def chat(msg):
     """Send a chat message to the HTTP API."""
     try:
-        r = requests.post("http://localhost:8001/v1/chat",
-                          json={"user_message": msg}, timeout=30)
+        r = _SESSION.post("http://localhost:8001/v1/chat",
+                          json={"user_message": msg}, timeout=_TIMEOUT)
         r.raise_for_status()
-        response_data = r.json()
+        response_data = _json.loads(r.content)
         return response_data.get("response", "")
     except requests.exceptions.ConnectionError:
         print("Error: Could not connect to chat server on localhost:8001")
@@ -57,11 +73,16 @@ def run_all_tests():
         ("Retry with misspelled timezone", test_bad_timezone_then_retry)
     ]
     
+    # The requests are independent and the server handles them
+    # concurrently, so issue them all at once
+    print(f"\n--- Running {len(tests)} tests concurrently ---")
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as pool:
+        futures = [(name, pool.submit(test_func)) for name, test_func in tests]
+    
     results = []
-    for name, test_func in tests:
-        print(f"\n--- Running {name} ---")
+    for name, future in futures:
         try:
-            test_func()
+            future.result()
             results.append((name, True))
             print(f"{name}: PASSED")
         except Exception as e:
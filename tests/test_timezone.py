@@ -33,7 +33,19 @@ def test_misspelled_timezone():
     assert "Asia/Tokyo" in result
     print(f"Misspelled timezone test passed: {result}")
 
+def test_known_timezones_skip_llm():
+    """Test that IANA names and abbreviations resolve without the LLM."""
+    assert "(Asia/Tokyo)" in get_time("JST")
+    assert "(America/New_York)" in get_time("est")
+    assert "(Europe/London)" in get_time("Europe/London")
+    assert "(UTC)" in get_time("utc")
+    assert "(Asia/Tokyo)" in get_time(" asia/tokyo ")
+    # GMT is fixed at UTC+0, never London's summer time
+    assert get_time("GMT").endswith(" GMT")
+    print("Known timezone test passed")
+
 if __name__ == "__main__":
+    test_known_timezones_skip_llm()
     test_timezone_normalization()
     test_misspelled_timezone()
     print("All timezone tests passed!")
\ No newline at end of file
@@ -5,76 +5,93 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.mcp_client import create_mcp_client
+from app.mcp_client import MCPOllamaClient, create_mcp_client
 
-async def test_tool_call():
+# The client fixture used under pytest lives in conftest.py
+
+async def test_tool_call(client: MCPOllamaClient):
     """Test basic tool calling functionality."""
-    try:
-        print("Creating MCP client...")
-        client = await create_mcp_client("app/main.py")
-        
-        # Test a tool call request
-        response = await client.chat_with_tools("What time is it in Tokyo?")
-        print(f"Tokyo time response: {response}")
-        
-        assert response is not None
-        assert len(response) > 0
-        assert "Tokyo" in response or "JST" in response
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Test a tool call request
+    response = await client.chat_with_tools("What time is it in Tokyo?")
+    print(f"Tokyo time response: {response}")
+    
+    assert response is not None
+    assert not response.startswith("Error")
+    assert "Tokyo" in response or "JST" in response
 
-async def test_misspelled_tool_call():
+async def test_misspelled_tool_call(client: MCPOllamaClient):
     """Test tool calling with misspelled timezone."""
-    try:
-        client = await create_mcp_client("app/main.py")
-        response = await client.chat_with_tools("Time in T0kyo pls")  # zero instead of 'o'
-        print(f"Misspelled Tokyo response: {response}")
-        
-        assert response is not None
-        assert "Tokyo" in response or "JST" in response
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error in misspelled test: {e}")
-        return False
+    response = await client.chat_with_tools("Time in T0kyo pls")  # zero instead of 'o'
+    print(f"Misspelled Tokyo response: {response}")
+    
+    assert response is not None
+    assert not response.startswith("Error")
+    assert "Tokyo" in response or "JST" in response
 
-async def test_joke_tool():
+async def test_joke_tool(client: MCPOllamaClient):
     """Test the random joke tool."""
-    try:
-        client = await create_mcp_client("app/main.py")
-        response = await client.chat_with_tools("Tell me a joke")
-        print(f"Joke response: {response}")
-        
-        assert response is not None
-        assert len(response) > 0
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error in joke test: {e}")
-        return False
+    response = await client.chat_with_tools("Tell me a joke")
+    print(f"Joke response: {response}")
+    
+    assert response is not None
+    assert not response.startswith("Error")
+    assert len(response) > 0
+
+def test_extract_tool_call():
+    """Test tool call extraction from surrounding prose."""
+    client = MCPOllamaClient("app/main.py")
+    
+    text = 'Sure! {"tool_call": {"name": "get_time_tool", "arguments": {"timezone": "}{ Tokyo"}}} Done.'
+    assert client.extract_tool_call(text) == {
+        "name": "get_time_tool",
+        "arguments": {"timezone": "}{ Tokyo"}
+    }
+    
+    assert client.extract_tool_call('{"tool_call": {"name": "random_joke_tool"}}') == {
+        "name": "random_joke_tool",
+        "arguments": {}
+    }
+    
+    assert client.extract_tool_call('{ "tool_call" : {"name": "random_joke_tool"}}') == {
+        "name": "random_joke_tool",
+        "arguments": {}
+    }
+    
+    batch = '{"tool_calls": [{"name": "random_joke_tool"}, {"name": "get_time_tool", "arguments": {"timezone": "UTC"}}]}'
+    assert client.extract_tool_calls(batch) == [
+        {"name": "random_joke_tool", "arguments": {}},
+        {"name": "get_time_tool", "arguments": {"timezone": "UTC"}}
+    ]
+    
+    assert client.extract_tool_call("Hello there!") is None
+    assert client.extract_tool_call('{"tool_call": {"name": "get_time_tool", ') is None
+    print("Extract tool call test passed")
 
 async def run_all_tests():
     """Run all tool call tests."""
+    # One MCP server process and tool discovery shared by every test
+    print("Creating MCP client...")
+    client = await create_mcp_client("app/main.py")
+    
     tests = [
-        ("Basic tool call", test_tool_call()),
-        ("Misspelled timezone", test_misspelled_tool_call()),
-        ("Joke tool", test_joke_tool())
+        ("Basic tool call", test_tool_call),
+        ("Misspelled timezone", test_misspelled_tool_call),
+        ("Joke tool", test_joke_tool)
     ]
     
     results = []
-    for name, test_coro in tests:
-        print(f"\n--- Running {name} ---")
-        result = await test_coro
-        results.append((name, result))
-        print(f"{name}: {'PASSED' if result else 'FAILED'}")
+    try:
+        for name, test_fn in tests:
+            print(f"\n--- Running {name} ---")
+            try:
+                await test_fn(client)
+                results.append((name, True))
+                print(f"{name}: PASSED")
+            except Exception as e:
+                results.append((name, False))
+                print(f"{name}: FAILED - {e!r}")
+    finally:
+        await client.close()
     
     print(f"\n--- Test Results ---")
     for name, result in results:
@@ -82,6 +99,8 @@ async def run_all_tests():
     
     all_passed = all(result for _, result in results)
     print(f"\nOverall: {'ALL TESTS PASSED' if all_passed else 'SOME TESTS FAILED'}")
+    return all_passed
 
 if __name__ == "__main__":
+    test_extract_tool_call()
     asyncio.run(run_all_tests())
\ No newline at end of file